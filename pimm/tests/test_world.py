@@ -68,6 +68,16 @@ class DummySMValue(SMCompliant):
         self.value = struct.unpack('d', buffer[:8])[0]
 
 
+class CountingSMValue(DummySMValue):
+    """DummySMValue that counts how many times it was read from shared memory."""
+
+    reads = 0
+
+    def read_from_buffer(self, buffer: memoryview | bytes) -> None:
+        CountingSMValue.reads += 1
+        super().read_from_buffer(buffer)
+
+
 class TestQueueEmitter:
     """Test the QueueEmitter class."""
 
@@ -336,6 +346,24 @@ class TestWorld:
             assert message2.updated is False
             assert message2.data == message.data
 
+    def test_mp_pipe_shared_memory_copies_only_updated_payloads(self):
+        CountingSMValue.reads = 0
+        with World() as world:
+            emitter, reader = world.mp_pipe()
+
+            emitter.emit(CountingSMValue(1.0))
+            for _ in range(3):
+                message = reader.read()
+            assert CountingSMValue.reads == 1
+            assert message.updated is False
+            assert message.data.value == pytest.approx(1.0)
+
+            emitter.emit(CountingSMValue(2.0))
+            message = reader.read()
+            assert CountingSMValue.reads == 2
+            assert message.updated is True
+            assert message.data.value == pytest.approx(2.0)
+
     def test_mp_pipe_rejects_incompatible_payload_after_shared_memory_selected(self):
         with World() as world:
             emitter, _ = world.mp_pipe()
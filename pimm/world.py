@@ -246,6 +246,7 @@ class MultiprocessReceiver(SignalReceiver[T]):
         self._sm_queue = sm_queue
         self._sm: multiprocessing.shared_memory.SharedMemory | None = None
         self._out_value: SMCompliant | None = None
+        self._out_value_synced = False
         self._readonly_buffer: memoryview | None = None
 
         self._last_queue_message: Message[T] | None = None
@@ -325,9 +326,13 @@ class MultiprocessReceiver(SignalReceiver[T]):
 
             assert self._readonly_buffer is not None
             assert self._out_value is not None
-            self._out_value.read_from_buffer(self._readonly_buffer)
             updated = self._up_value.value
-            self._up_value.value = False
+            # The buffer only changes on emit, so copy it out only when there is something new
+            if updated or not self._out_value_synced:
+                self._out_value.read_from_buffer(self._readonly_buffer)
+                self._out_value_synced = True
+            if updated:
+                self._up_value.value = False
             return Message(data=self._out_value, ts=self._ts_value.value, updated=updated)
 
     def read(self) -> Message[T] | None:
@@ -472,6 +477,7 @@ class World:
         self._cleanup_emitters_readers = []
         self.entered = False
         self._connections = []
+        self._connected_receivers = set()  # Mirrors receivers in _connections for O(1) uniqueness checks
 
     def __enter__(self):
         self.entered = True
@@ -583,11 +589,12 @@ class World:
         underlying signal transport mechanisms, such as adding logging,
         filtering, or other middleware functionality.
         """
-        assert receiver not in [e[1] for e in self._connections], 'Receiver can be connected only to one Emitter'
+        assert receiver not in self._connected_receivers, 'Receiver can be connected only to one Emitter'
         assert isinstance(emitter, ControlSystemEmitter)
         assert isinstance(receiver, ControlSystemReceiver)
         if not isinstance(emitter, FakeEmitter) and not isinstance(receiver, FakeReceiver):
             self._connections.append((emitter, receiver, emitter_wrapper, receiver_wrapper))
+            self._connected_receivers.add(receiver)
 
     def pair(
         self,
@@ -1,9 +1,11 @@
+import math
 import time
 from collections.abc import Callable, Iterator, Sequence
 from contextlib import nullcontext
 from enum import Enum
 
 import configuronic as cfn
+import numba
 import numpy as np
 
 import pimm
@@ -30,29 +32,82 @@ from positronic.simulator.mujoco.sim import MujocoCameras, MujocoFranka, MujocoG
 from positronic.simulator.mujoco.transforms import MujocoSceneTransform
 from positronic.utils.buttons import ButtonHandler
 
+_START_WAV_PATH = 'positronic/assets/sounds/recording-has-started.wav'
+_END_WAV_PATH = 'positronic/assets/sounds/recording-has-stopped.wav'
+_ABORT_WAV_PATH = 'positronic/assets/sounds/recording-has-been-aborted.wav'
+# Trigger changes smaller than this are treated as noise and not re-sent to the gripper
+_GRIP_EPS = 1e-3
+
+# Button names and their indices in the WebXR buttons array for each controller side
+_BUTTON_KEYS = {
+    'left': (('left_A', 4), ('left_B', 5), ('left_trigger', 0), ('left_thumb', 1), ('left_stick', 3)),
+    'right': (('right_A', 4), ('right_B', 5), ('right_trigger', 0), ('right_thumb', 1), ('right_stick', 3)),
+}
+
 
 def _parse_buttons(buttons: dict, button_handler: ButtonHandler):
-    for side in ['left', 'right']:
-        if buttons[side] is None:
+    for side, keys in _BUTTON_KEYS.items():
+        values = buttons[side]
+        if values is None:
             continue
 
-        mapping = {
-            f'{side}_A': buttons[side][4],
-            f'{side}_B': buttons[side][5],
-            f'{side}_trigger': buttons[side][0],
-            f'{side}_thumb': buttons[side][1],
-            f'{side}_stick': buttons[side][3],
-        }
-        button_handler.update_buttons(mapping)
+        for name, idx in keys:
+            button_handler.update_button(name, values[idx])
 
 
-class _Tracker:
-    on = False
-    _offset = geom.Transform3D()
-    _teleop_t = geom.Transform3D()
+@numba.njit(cache=True)
+def _quat_mul(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Hamilton product of two (w, x, y, z) quaternions, same convention as `geom.Rotation.__mul__`."""
+    out = np.empty(4)
+    out[0] = a[0] * b[0] - a[1] * b[1] - a[2] * b[2] - a[3] * b[3]
+    out[1] = a[0] * b[1] + a[1] * b[0] + a[2] * b[3] - a[3] * b[2]
+    out[2] = a[0] * b[2] - a[1] * b[3] + a[2] * b[0] + a[3] * b[1]
+    out[3] = a[0] * b[3] + a[1] * b[2] - a[2] * b[1] + a[3] * b[0]
+    return out
+
+
+@numba.njit(cache=True)
+def _quat_rotate(q: np.ndarray, v: np.ndarray) -> np.ndarray:
+    """Rotate a 3D vector by a unit (w, x, y, z) quaternion, same as `geom.Rotation.__call__`."""
+    qv = np.empty(4)
+    qv[0] = 0.0
+    qv[1:] = v
+    q_inv = np.empty(4)
+    q_inv[0] = q[0]
+    q_inv[1:] = -q[1:]
+    return _quat_mul(_quat_mul(q, qv), q_inv)[1:]
+
+
+@numba.njit(cache=True)
+def _track(translation, rotation, op_translation, op_rotation, op_rotation_inv, offset_translation, offset_rotation):
+    """Conjugate a tracker pose by the operator position and apply the tracking offset.
+
+    Returns translation and rotation of both the teleop pose (op * pose * op.inv) and the offset target pose.
+    """
+    teleop_rotation = _quat_mul(_quat_mul(op_rotation, rotation), op_rotation_inv)
+    teleop_translation = op_translation + _quat_rotate(op_rotation, translation)
+    teleop_translation -= _quat_rotate(teleop_rotation, op_translation)
+    target_rotation = _quat_mul(teleop_rotation, offset_rotation)
+    return teleop_translation, teleop_rotation, teleop_translation + offset_translation, target_rotation
 
+
+class _Tracker:
     def __init__(self, operator_position: geom.Transform3D | None):
         self._operator_position = operator_position
+        # Offset and the latest teleop pose are kept as raw components to avoid building Transform3D per update.
+        # They are per-instance, so trackers never share (and accidentally mutate) each other's arrays.
+        self._offset_translation = np.zeros(3)
+        self._offset_rotation = geom.Rotation.identity
+        self._teleop_translation = np.zeros(3)
+        self._teleop_rotation = geom.Rotation.identity
+        if operator_position is not None:
+            # Operator position is constant, so precompute everything needed to conjugate tracker poses by it
+            self._op_rotation = operator_position.rotation.as_quat.astype(np.float64)
+            self._op_rotation_inv = operator_position.rotation.inv.as_quat.astype(np.float64)
+            self._op_translation = operator_position.translation.astype(np.float64)
+            # Compile (or load from cache) the jitted kernel now, so the first controller update does not stall.
+            # Conjugating the identity pose gives the identity, so this leaves the teleop pose unchanged.
+            self.update(geom.Transform3D())
         self.on = self.umi_mode
 
     @property
@@ -66,9 +121,8 @@ class _Tracker:
 
         self.on = True
         print('Starting tracking')
-        self._offset = geom.Transform3D(
-            -self._teleop_t.translation + robot_pos.translation, self._teleop_t.rotation.inv * robot_pos.rotation
-        )
+        self._offset_translation = -self._teleop_translation + robot_pos.translation
+        self._offset_rotation = self._teleop_rotation.inv * robot_pos.rotation
 
     def turn_off(self):
         if self.umi_mode:
@@ -81,10 +135,17 @@ class _Tracker:
         if self.umi_mode:
             return tracker_pos
 
-        self._teleop_t = self._operator_position * tracker_pos * self._operator_position.inv
-        return geom.Transform3D(
-            self._teleop_t.translation + self._offset.translation, self._teleop_t.rotation * self._offset.rotation
+        teleop_translation, teleop_rotation, translation, rotation = _track(
+            tracker_pos.translation.astype(np.float64, copy=False),
+            tracker_pos.rotation.as_quat,
+            self._op_translation,
+            self._op_rotation,
+            self._op_rotation_inv,
+            self._offset_translation,
+            self._offset_rotation.as_quat,
         )
+        self._teleop_translation, self._teleop_rotation = teleop_translation, teleop_rotation.view(geom.Rotation)
+        return geom.Transform3D(translation, rotation.view(geom.Rotation))
 
 
 class OperatorPosition(Enum):
@@ -95,9 +156,16 @@ class OperatorPosition(Enum):
 
 
 class DataCollectionController(pimm.ControlSystem):
-    def __init__(self, operator_position: geom.Transform3D | None, metadata_getter: Callable[[], dict] | None = None):
+    def __init__(
+        self,
+        operator_position: geom.Transform3D | None,
+        metadata_getter: Callable[[], dict] | None = None,
+        tick_hz: float = 1000.0,
+    ):
         self.operator_position = operator_position
         self.metadata_getter = metadata_getter or (lambda: {})
+        self._tick_period = 1.0 / tick_hz
+        # Default maxsize keeps only the latest message in the channel, so stale poses are never replayed
         self.controller_positions = pimm.ControlSystemReceiver(self, default=None)
         self.buttons_receiver = pimm.ControlSystemReceiver(self)
         self.robot_state = pimm.ControlSystemReceiver(self)
@@ -111,64 +179,77 @@ class DataCollectionController(pimm.ControlSystem):
         self.sound = pimm.ControlSystemEmitter(self)
 
     def run(self, should_stop: pimm.SignalReceiver, clock: pimm.Clock) -> Iterator[pimm.Sleep]:  # noqa: C901
-        start_wav_path = 'positronic/assets/sounds/recording-has-started.wav'
-        end_wav_path = 'positronic/assets/sounds/recording-has-stopped.wav'
-        abort_wav_path = 'positronic/assets/sounds/recording-has-been-aborted.wav'
-
         tracker = _Tracker(self.operator_position)
         button_handler = ButtonHandler()
 
         recording = False
+        last_grip = None
 
         while not should_stop.value:
             try:
-                _parse_buttons(self.buttons_receiver.value, button_handler)
-                if button_handler.just_pressed('right_B'):
-                    op = DsWriterCommandType.START_EPISODE if not recording else DsWriterCommandType.STOP_EPISODE
-                    meta = self.metadata_getter() if op == DsWriterCommandType.START_EPISODE else {}
-                    self.ds_agent_commands.emit(DsWriterCommand(op, meta))
-                    self.sound.emit(start_wav_path if not recording else end_wav_path)
-                    recording = not recording
-                elif button_handler.just_pressed('right_A'):
-                    if tracker.on:
+                # Buttons only change when a new message arrives, so skip the whole pass otherwise.
+                buttons_msg = self.buttons_receiver.read()
+                if buttons_msg is None:
+                    raise pimm.NoValueException
+                if buttons_msg.updated:
+                    _parse_buttons(buttons_msg.data, button_handler)
+                    if button_handler.just_pressed('right_B'):
+                        op = DsWriterCommandType.START_EPISODE if not recording else DsWriterCommandType.STOP_EPISODE
+                        meta = self.metadata_getter() if op == DsWriterCommandType.START_EPISODE else {}
+                        self.ds_agent_commands.emit(DsWriterCommand(op, meta))
+                        self.sound.emit(_START_WAV_PATH if not recording else _END_WAV_PATH)
+                        recording = not recording
+                        # Re-send the current grip so every episode starts with a target_grip sample
+                        last_grip = None
+                    elif button_handler.just_pressed('right_A'):
+                        if tracker.on:
+                            tracker.turn_off()
+                        else:
+                            tracker.turn_on(self.robot_state.value.ee_pose)
+                    elif button_handler.just_pressed('right_stick') and not tracker.umi_mode:
+                        print('Resetting robot')
+                        if recording:
+                            self.ds_agent_commands.emit(DsWriterCommand.ABORT())
+                            self.sound.emit(_ABORT_WAV_PATH)
                         tracker.turn_off()
-                    else:
-                        tracker.turn_on(self.robot_state.value.ee_pose)
-                elif button_handler.just_pressed('right_stick') and not tracker.umi_mode:
-                    print('Resetting robot')
-                    if recording:
-                        self.ds_agent_commands.emit(DsWriterCommand.ABORT())
-                        self.sound.emit(abort_wav_path)
-                    tracker.turn_off()
-                    recording = False
-                    self.robot_commands.emit(roboarm.command.Reset())
-
-                self.target_grip.emit(button_handler.get_value('right_trigger'))
+                        recording = False
+                        self.robot_commands.emit(roboarm.command.Reset())
+
+                    grip = button_handler.get_value('right_trigger')
+                    if last_grip is None or abs(grip - last_grip) > _GRIP_EPS:
+                        self.target_grip.emit(grip)
+                        last_grip = grip
+
                 cp_msg = self.controller_positions.read()
                 if cp_msg.updated:
                     target_robot_pos = tracker.update(cp_msg.data['right'])
                     if tracker.on:  # Don't spam the robot with commands.
                         self.robot_commands.emit(roboarm.command.CartesianPosition(target_robot_pos))
 
-                yield pimm.Sleep(0.001)
+                yield pimm.Sleep(self._tick_period)
 
             except pimm.NoValueException:
-                yield pimm.Sleep(0.001)
+                yield pimm.Sleep(self._tick_period)
                 continue
 
 
 def controller_positions_serializer(controller_positions: dict[str, geom.Transform3D]) -> dict[str, np.ndarray]:
+    # All sides share one buffer, so each sample costs a single allocation. The rows must not be reused
+    # across samples, since episode writers keep references to appended values until they flush.
+    buffer = np.empty((len(controller_positions), 7))
     res = {}
-    for side, pos in controller_positions.items():
+    for row, (side, pos) in zip(buffer, controller_positions.items(), strict=True):
         if pos is not None:
-            res[f'.{side}'] = Serializers.transform_3d(pos)
+            res[f'.{side}'] = Serializers.transform_3d(pos, out=row)
     return res
 
 
 def _wrench_to_level(state: roboarm.State) -> float | None:
-    if state.ee_wrench is None:
+    wrench = state.ee_wrench
+    if wrench is None:
         return None
-    return np.linalg.norm(state.ee_wrench)
+    # For a 6-vector, a dot product is much cheaper than the generic np.linalg.norm dispatch
+    return math.sqrt(wrench @ wrench)
 
 
 def _wire(
@@ -204,13 +285,14 @@ def main(
     stream_video_to_webxr: str | None = None,
     operator_position: OperatorPosition = OperatorPosition.FRONT,
     task: str | None = None,
+    tick_hz: float = 1000.0,
 ):
     """Runs data collection in real hardware."""
     # Convert camera instances to emitters for wire()
     camera_instances = cameras or {}
     camera_emitters = {name: cam.frame for name, cam in camera_instances.items()}
     static_getter = None if task is None else lambda: {'task': task}
-    data_collection = DataCollectionController(operator_position.value, metadata_getter=static_getter)
+    data_collection = DataCollectionController(operator_position.value, metadata_getter=static_getter, tick_hz=tick_hz)
 
     writer_cm = LocalDatasetWriter(pos3.upload(output_dir)) if output_dir is not None else nullcontext(None)
     with writer_cm as dataset_writer, pimm.World() as world:
@@ -257,15 +339,19 @@ def main_sim(
     fps: int = 30,
     operator_position: OperatorPosition = OperatorPosition.FRONT,
     task: str | None = None,
+    tick_hz: float | None = None,
 ):
-    """Runs data collection in simulator."""
+    """Runs data collection in simulator.
+
+    If `tick_hz` is not set, the controller is polled at `max(fps, 200)` Hz of simulated time.
+    """
 
     sim = MujocoSim(mujoco_model_path, loaders)
     robot_arm = MujocoFranka(sim, suffix='_ph')
 
     mujoco_cameras = MujocoCameras(sim.model, sim.data, resolution=(320, 240), fps=fps)
     cameras = {name: mujoco_cameras.cameras[orig_name] for name, orig_name in cameras.items()}
-    gui = DearpyguiUi()
+    gui = DearpyguiUi(update_hz=fps)
     gripper = MujocoGripper(sim, actuator_name='actuator8_ph', joint_name='finger_joint1_ph')
 
     def metadata_getter():
@@ -274,7 +360,10 @@ def main_sim(
             result['task'] = task
         return result
 
-    data_collection = DataCollectionController(operator_position.value, metadata_getter=metadata_getter)
+    tick_hz = tick_hz if tick_hz is not None else max(fps, 200)
+    data_collection = DataCollectionController(
+        operator_position.value, metadata_getter=metadata_getter, tick_hz=tick_hz
+    )
 
     writer_cm = LocalDatasetWriter(pos3.upload(output_dir)) if output_dir is not None else nullcontext(None)
     with writer_cm as dataset_writer, pimm.World(clock=sim) as world:
@@ -286,16 +375,19 @@ def main_sim(
         )
         sim_iter = iter(sim_iter)
 
-        start_time = pimm.world.SystemClock().now_ns()
+        system_clock = pimm.world.SystemClock()
+        start_time = system_clock.now_ns()
         sim_start_time = sim.now_ns()
 
         while not world.should_stop:
             try:
-                time_since_start = pimm.world.SystemClock().now_ns() - start_time
-                if sim.now_ns() < sim_start_time + time_since_start:
+                time_since_start = system_clock.now_ns() - start_time
+                sim_ahead_ns = sim.now_ns() - sim_start_time - time_since_start
+                if sim_ahead_ns < 0:
                     next(sim_iter)
                 else:
-                    time.sleep(0.001)
+                    # Sleep exactly until the wall clock catches up with the simulation
+                    time.sleep(sim_ahead_ns / 1e9)
             except StopIteration:
                 break
 
@@ -311,6 +403,7 @@ main_cfg = cfn.Config(
         'image.right': positronic.cfg.hardware.camera.arducam_right,
     },
     operator_position=OperatorPosition.FRONT,
+    tick_hz=1000.0,
 )
 
 
@@ -320,6 +413,7 @@ main_cfg = cfn.Config(
     sound=positronic.cfg.sound.sound,
     operator_position=OperatorPosition.BACK,
     cameras={'image.right': positronic.cfg.hardware.camera.arducam_right},
+    tick_hz=1000.0,
 )
 def so101cfg(robot_arm, **kwargs):
     """Runs data collection on SO101 robot"""
@@ -337,6 +431,7 @@ droid = cfn.Config(
         'image.exterior': positronic.cfg.hardware.camera.zed_2i.override(view='left', resolution='hd720', fps=30),
     },
     operator_position=OperatorPosition.BACK,
+    tick_hz=1000.0,
 )
 
 
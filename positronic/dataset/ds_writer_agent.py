@@ -79,9 +79,16 @@ class Serializers:
     """
 
     @staticmethod
-    def transform_3d(x: geom.Transform3D) -> np.ndarray:
-        """Serialize a Transform3D into a 7D vector [tx, ty, tz, qx, qy, qz, qw]."""
-        return x.as_vector(geom.Rotation.Representation.QUAT)
+    def transform_3d(x: geom.Transform3D, out: np.ndarray | None = None) -> np.ndarray:
+        """Serialize a Transform3D into a 7D vector [tx, ty, tz, qx, qy, qz, qw].
+
+        If `out` is provided, the vector is written into it instead of allocating a new array.
+        """
+        if out is None:
+            return x.as_vector(geom.Rotation.Representation.QUAT)
+        out[:3] = x.translation
+        out[3:] = x.rotation.as_quat
+        return out
 
     @staticmethod
     def robot_state(state: roboarm.State) -> dict[str, np.ndarray] | None:
@@ -168,6 +175,7 @@ class DsWriterAgent(pimm.ControlSystem):
         appending are split into helpers.
         """
         limiter = pimm.utils.RateLimiter(clock, hz=self._poll_hz)
+        system_clock = pimm.world.SystemClock()
         ep_writer: EpisodeWriter | None = None
         ep_counter = 0
 
@@ -184,7 +192,7 @@ class DsWriterAgent(pimm.ControlSystem):
                             world_time_ns, message_time_ns = clock.now_ns(), msg.ts
                             primary_ts = world_time_ns if self._time_mode == TimeMode.CLOCK else message_time_ns
 
-                            extra_ts = {'message': message_time_ns, 'system': pimm.world.SystemClock().now_ns()}
+                            extra_ts = {'message': message_time_ns, 'system': system_clock.now_ns()}
                             # Only add 'world' if clock is not system clock
                             if not isinstance(clock, pimm.world.SystemClock):
                                 extra_ts['world'] = world_time_ns
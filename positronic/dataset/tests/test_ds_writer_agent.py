@@ -341,6 +341,16 @@ def test_transform_3d_serializer(world, clock):
     np.testing.assert_allclose(names_vals[0][1][3:], q.as_quat)
 
 
+def test_transform_3d_serializer_writes_into_out():
+    pose = geom.Transform3D(translation=np.array([0.1, -0.2, 0.3]), rotation=geom.Rotation.from_euler([0.1, 0.2, 0.3]))
+    out = np.zeros(7)
+
+    result = Serializers.transform_3d(pose, out=out)
+
+    assert result is out
+    np.testing.assert_allclose(out, Serializers.transform_3d(pose))
+
+
 class _FakeState(roboarm.State):
     def __init__(self, q, dq, ee_pose, status):
         self._q = q
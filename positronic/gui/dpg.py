@@ -14,7 +14,8 @@ def _get_down_keys() -> list[int]:
 
 
 class DearpyguiUi(pimm.ControlSystem):
-    def __init__(self):
+    def __init__(self, update_hz: float = 60.0):
+        self.update_hz = update_hz
         self.cameras = pimm.ReceiverDict(self, default=None)
         self.im_sizes = {}
         self.info = pimm.ControlSystemReceiver(self, default='')
@@ -65,6 +66,7 @@ class DearpyguiUi(pimm.ControlSystem):
         dpg.show_viewport(maximized=True)
 
     def run(self, should_stop: pimm.SignalReceiver, clock: pimm.Clock) -> Iterator[pimm.Sleep]:
+        limiter = pimm.RateLimiter(clock, hz=self.update_hz)
         fps_counter = pimm.utils.RateCounter('UI')
         frame_fps_counter = pimm.utils.RateCounter('Frame')
 
@@ -104,7 +106,7 @@ class DearpyguiUi(pimm.ControlSystem):
                 dpg.set_value('info', info_text)
                 dpg.render_dearpygui_frame()
 
-            yield pimm.Pass()
+            yield pimm.Sleep(limiter.wait_time())
 
     def _configure_image_grid(self, n_images: int):
         if n_images == 0:
@@ -124,7 +124,7 @@ def main(
             mujoco_cameras = MujocoCameras(sim.model, sim.data, resolution=(320, 240), fps=fps)
             cameras_mapped = {name: mujoco_cameras.cameras[orig_name] for name, orig_name in cameras.items()}
             gripper = MujocoGripper(sim, actuator_name='actuator8_ph', joint_name='finger_joint1_ph')
-            gui = DearpyguiUi() if show_gui else None
+            gui = DearpyguiUi(update_hz=fps) if show_gui else None
 
             replay = Replay()
 
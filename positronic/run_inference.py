@@ -302,7 +302,7 @@ def main_sim(
     if task is not None:
         meta['inference.task'] = task
 
-    gui = DearpyguiUi() if show_gui else None
+    gui = DearpyguiUi(update_hz=camera_fps) if show_gui else None
 
     writer_cm = LocalDatasetWriter(pos3.upload(output_dir)) if output_dir is not None else nullcontext(None)
     with writer_cm as dataset_writer, pimm.World(clock=sim) as world:
@@ -12,7 +12,7 @@ except ModuleNotFoundError:  # pragma: no cover - optional dependency
 
 @pytest.mark.skipif(DearpyguiUi is None, reason='dearpygui is not available')
 def test_dearpygui_ui_is_picklable():
-    gui = DearpyguiUi()
+    gui = DearpyguiUi(update_hz=30.0)
     original_receiver = gui.cameras['cam']
 
     data = pickle.dumps(gui)
@@ -21,3 +21,4 @@ def test_dearpygui_ui_is_picklable():
     assert isinstance(original_receiver, pimm.ControlSystemReceiver)
     assert isinstance(restored.cameras['cam'], pimm.ControlSystemReceiver)
     assert isinstance(restored.cameras['new_cam'], pimm.ControlSystemReceiver)
+    assert restored.update_hz == 30.0
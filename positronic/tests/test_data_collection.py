@@ -1,5 +1,6 @@
 from collections.abc import Callable
 from pathlib import Path
+from types import SimpleNamespace
 
 import numpy as np
 import pytest
@@ -7,11 +8,19 @@ import pytest
 import pimm
 from pimm.tests.testing import MockClock
 from positronic import wire
-from positronic.data_collection import DataCollectionController, controller_positions_serializer
+from positronic.data_collection import (
+    DataCollectionController,
+    OperatorPosition,
+    _parse_buttons,
+    _Tracker,
+    _wrench_to_level,
+    controller_positions_serializer,
+)
 from positronic.dataset.ds_writer_agent import DsWriterAgent, DsWriterCommand, DsWriterCommandType, Serializers
 from positronic.dataset.local_dataset import LocalDataset, LocalDatasetWriter
 from positronic.geom import Rotation, Transform3D
-from positronic.tests.testing_coutils import ManualDriver, drive_scheduler
+from positronic.tests.testing_coutils import ManualDriver, MutableShouldStop, drive_scheduler
+from positronic.utils.buttons import ButtonHandler
 
 
 # TODO: Move these fixtures into a common module so that others can reuse them.
@@ -165,6 +174,158 @@ def test_data_collection_basic_recording(tmp_path, world, clock):
     assert grip[0][0] == 0.42
 
 
+def test_data_collection_processes_buttons_only_on_new_messages(tmp_path, world, clock):
+    dc, agent, _ctrl_em_dc, _ctrl_em_agent, buttons_em, _grip_em, writer_cm, robot = build_collection(world, tmp_path)
+
+    def start_episode():
+        dc.ds_agent_commands.emit(DsWriterCommand(DsWriterCommandType.START_EPISODE))
+
+    def stop_episode():
+        dc.ds_agent_commands.emit(DsWriterCommand(DsWriterCommandType.STOP_EPISODE))
+
+    driver = ManualDriver([
+        (start_episode, 0.001),
+        (lambda: buttons_em.emit(make_buttons(trigger=0.3)), 0.05),
+        (stop_episode, 0.001),
+    ])
+
+    with writer_cm:
+        scheduler = world.start([dc, agent, robot, driver])
+        drive_scheduler(scheduler, clock=clock)
+
+    ds = LocalDataset(tmp_path)
+    assert len(ds) == 1
+    # A single buttons message must produce a single target_grip sample, no matter how many ticks pass
+    tgt_grip = ds[0]['target_grip']
+    assert len(tgt_grip) == 1
+    assert tgt_grip[0][0] == 0.3
+
+
+def test_data_collection_emits_target_grip_only_on_change(tmp_path, world, clock):
+    dc, agent, _ctrl_em_dc, _ctrl_em_agent, buttons_em, _grip_em, writer_cm, robot = build_collection(world, tmp_path)
+
+    def start_episode():
+        dc.ds_agent_commands.emit(DsWriterCommand(DsWriterCommandType.START_EPISODE))
+
+    def stop_episode():
+        dc.ds_agent_commands.emit(DsWriterCommand(DsWriterCommandType.STOP_EPISODE))
+
+    driver = ManualDriver([
+        (start_episode, 0.001),
+        (lambda: buttons_em.emit(make_buttons(trigger=0.3)), 0.005),
+        (lambda: buttons_em.emit(make_buttons(trigger=0.3)), 0.005),
+        (lambda: buttons_em.emit(make_buttons(trigger=0.3004)), 0.005),
+        (lambda: buttons_em.emit(make_buttons(trigger=0.5)), 0.005),
+        (stop_episode, 0.001),
+    ])
+
+    with writer_cm:
+        scheduler = world.start([dc, agent, robot, driver])
+        drive_scheduler(scheduler, clock=clock)
+
+    ds = LocalDataset(tmp_path)
+    assert len(ds) == 1
+    tgt_grip = ds[0]['target_grip']
+    assert [val for (val, _) in tgt_grip[:]] == [0.3, 0.5]
+
+
+def test_data_collection_follows_only_latest_controller_position(tmp_path, world, clock):
+    dc, agent, ctrl_em_dc, _ctrl_em_agent, buttons_em, _grip_em, writer_cm, robot = build_collection(world, tmp_path)
+
+    stale_pose = Transform3D(translation=np.array([0.1, 0.0, 0.0]), rotation=Rotation.identity)
+    latest_pose = Transform3D(translation=np.array([0.2, 0.0, 0.0]), rotation=Rotation.identity)
+
+    def start_episode():
+        dc.ds_agent_commands.emit(DsWriterCommand(DsWriterCommandType.START_EPISODE))
+        buttons_em.emit(make_buttons())
+
+    def emit_backlog():
+        ctrl_em_dc.emit({'left': None, 'right': stale_pose})
+        ctrl_em_dc.emit({'left': None, 'right': latest_pose})
+
+    def stop_episode():
+        dc.ds_agent_commands.emit(DsWriterCommand(DsWriterCommandType.STOP_EPISODE))
+
+    driver = ManualDriver([(start_episode, 0.002), (emit_backlog, 0.005), (stop_episode, 0.001)])
+
+    with writer_cm:
+        scheduler = world.start([dc, agent, robot, driver])
+        drive_scheduler(scheduler, clock=clock)
+
+    # UMI mode tracks from the start, so every processed pose becomes a robot command
+    cmd_pose = LocalDataset(tmp_path)[0]['robot_commands.pose']
+    assert len(cmd_pose) == 1
+    np.testing.assert_allclose(cmd_pose[0][0][:3], latest_pose.translation)
+
+
+def test_parse_buttons_maps_webxr_indices():
+    handler = ButtonHandler()
+    _parse_buttons({'left': [0.1, 0.2, 0.0, 0.3, 1.0, 0.0], 'right': None}, handler)
+
+    assert handler.get_value('left_trigger') == 0.1
+    assert handler.get_value('left_thumb') == 0.2
+    assert handler.get_value('left_stick') == 0.3
+    assert handler.just_pressed('left_A')
+    assert not handler.just_pressed('left_B')
+    assert not handler.just_pressed('right_A')
+
+
+@pytest.mark.parametrize(
+    'operator_position',
+    [
+        OperatorPosition.FRONT.value,
+        OperatorPosition.BACK.value,
+        Transform3D(translation=np.array([0.5, -0.2, 1.0]), rotation=Rotation.from_euler([0.3, -0.1, 0.7])),
+    ],
+)
+def test_tracker_update_matches_operator_conjugation(operator_position):
+    tracker = _Tracker(operator_position)
+    tracker_pos = Transform3D(translation=np.array([0.1, 0.2, 0.3]), rotation=Rotation.from_euler([0.2, 0.4, -0.6]))
+
+    result = tracker.update(tracker_pos)
+
+    expected = operator_position * tracker_pos * operator_position.inv
+    np.testing.assert_allclose(result.translation, expected.translation, atol=1e-12)
+    np.testing.assert_allclose(result.rotation.as_quat, expected.rotation.as_quat, atol=1e-12)
+
+
+def test_tracker_turn_on_aligns_with_robot_pose():
+    tracker = _Tracker(OperatorPosition.BACK.value)
+    tracker_pos = Transform3D(translation=np.array([0.1, 0.2, 0.3]), rotation=Rotation.from_euler([0.2, 0.4, -0.6]))
+    robot_pos = Transform3D(translation=np.array([0.5, 0.0, 0.4]), rotation=Rotation.from_euler([3.1, 0.0, 0.2]))
+
+    tracker.update(tracker_pos)
+    tracker.turn_on(robot_pos)
+    result = tracker.update(tracker_pos)
+
+    np.testing.assert_allclose(result.translation, robot_pos.translation, atol=1e-12)
+    np.testing.assert_allclose(result.rotation.as_quat, robot_pos.rotation.as_quat, atol=1e-12)
+
+
+def test_trackers_do_not_share_state():
+    first = _Tracker(OperatorPosition.FRONT.value)
+    second = _Tracker(OperatorPosition.FRONT.value)
+
+    first._offset_translation[:] = 1.0
+
+    np.testing.assert_allclose(second._offset_translation, np.zeros(3))
+    assert first._teleop_translation is not second._teleop_translation
+
+
+def test_wrench_to_level_is_wrench_norm():
+    wrench = np.array([1.0, -2.0, 3.0, 0.5, -0.5, 0.25])
+
+    assert _wrench_to_level(SimpleNamespace(ee_wrench=wrench)) == pytest.approx(np.linalg.norm(wrench))
+    assert _wrench_to_level(SimpleNamespace(ee_wrench=None)) is None
+
+
+def test_data_collection_tick_hz_sets_poll_period():
+    dc = DataCollectionController(operator_position=None, tick_hz=50.0)
+    loop = dc.run(MutableShouldStop(), MockClock())
+
+    assert next(loop).seconds == pytest.approx(0.02)
+
+
 def test_data_collection_with_mujoco_robot_gripper(tmp_path):
     # Build Mujoco simulation and components
     from positronic.data_collection import OperatorPosition